@@ -1,20 +1,31 @@
-from phtoolz.metrics.cli import cli as metricsCli
-from phtoolz.stocks.cli import cli as stocksCli
-from phtoolz.treas.cli import cli as treasCli
-from phtoolz.vests.cli import cli as vestsCli
+# import commands lazily - parallel workers re-import the entry point on startup
 
 
 def metrics():
-    metricsCli()
+    from phtoolz.metrics.cli import cli
+
+    cli()
+
+
+def prices():
+    from phtoolz.prices.cli import cli
+
+    cli()
 
 
 def stocks():
-    stocksCli()
+    from phtoolz.stocks.cli import cli
+
+    cli()
 
 
 def treas():
-    treasCli()
+    from phtoolz.treas.cli import cli
+
+    cli()
 
 
 def vests():
-    vestsCli()
+    from phtoolz.vests.cli import cli
+
+    cli()
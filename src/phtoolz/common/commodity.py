@@ -2,7 +2,7 @@
 
 import re
 from collections import defaultdict
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import Iterable, Iterator, Literal, NamedTuple
 
@@ -14,6 +14,13 @@ from phtoolz.common.util import dateRange
 _tBillPattern = re.compile(r"^.*\((.*) - (.*)\).*$")
 _stockPattern = re.compile(r"^[A-Z]+$")
 
+# keep the journal thin - full daily values only within this window
+RECENT_DAYS = 90
+# and at most 1 value per window of this many days before it
+HISTORICAL_INTERVAL_DAYS = 30
+# fixed start of the first historical window
+_historicalEpoch = date(1970, 1, 1)
+
 
 class CommodityValue(NamedTuple):
     """Value of 1 unit of a commodity at a particular time."""
@@ -61,6 +68,28 @@ def values(
                     )
 
 
+def thin(values: Iterable[CommodityValue], end: date) -> Iterator[CommodityValue]:
+    """
+    Returns `values` keeping all those within `RECENT_DAYS` before `end`, and before then only the earliest value of a commodity in each fixed `HISTORICAL_INTERVAL_DAYS` window.
+    Values are returned sorted by `(name, time)`, with earlier-given values first among equal keys.
+    """
+
+    cutoff = end - timedelta(days=RECENT_DAYS)
+
+    keptWindows = set[tuple[str, int]]()
+    for t in sorted(values, key=lambda t: (t.name, t.time)):
+        if t.time >= cutoff:
+            yield t
+        else:
+            window = (
+                t.name,
+                (t.time - _historicalEpoch).days // HISTORICAL_INTERVAL_DAYS,
+            )
+            if window not in keptWindows:
+                keptWindows.add(window)
+                yield t
+
+
 def typeOf(commodity: str):
     """Returns the general classification of `commodity`."""
 
@@ -3,10 +3,12 @@
 import csv
 import re
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 from decimal import Decimal
 from typing import NamedTuple, Optional
 
+from phtoolz.common import register
 from phtoolz.common.commodity import CommodityValue
 
 
@@ -83,8 +85,10 @@ class Ledger:
             }.values()
         )
 
-    def transactions(self, forecastOnly: bool = False) -> list[Transaction]:
-        """Returns transactions (optionally `forecastOnly`) from ledger."""
+    def transactions(
+        self, forecastOnly: bool = False, jobs: int = 1
+    ) -> list[Transaction]:
+        """Returns transactions (optionally `forecastOnly`) from ledger, parsed across `jobs` processes."""
 
         args = ["hledger", "register", "-O", "tsv"]
         if self.path:
@@ -92,40 +96,26 @@ class Ledger:
         if forecastOnly:
             args.extend(("--forecast=2010..", "tag:generated"))
 
-        # returns in format (txnidx date code description account amount total)
-        reader = csv.reader(
-            subprocess.check_output(args).decode().splitlines(),
-            delimiter="\t",
-        )
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1: {jobs}")
+
+        output = subprocess.check_output(args)
 
         # skip headers
-        next(reader)
-
-        # combine transactions with same (account, date, commodity)
-        transactions = dict[tuple[str, date, str], Transaction]()
-        for line in reader:
-            time = date.fromisoformat(line[1])
-            account = line[4]
-
-            quantityCommodity = line[5]
-            if " " in quantityCommodity:
-                splitI = quantityCommodity.index(" ")
-                quantity = Decimal(quantityCommodity[:splitI])
-                commodity = quantityCommodity[(splitI + 1) :].replace('"', "")
-            else:
-                quantity = Decimal(quantityCommodity)
-                commodity = "USD"
-
-            key = (account, time, commodity)
-            if key in transactions:
-                current = transactions[key]
-                transactions[key] = Transaction(
-                    time, account, commodity, current.quantity + quantity
+        body = output[output.find(b"\n") + 1 :] if b"\n" in output else b""
+
+        if jobs > 1:
+            with ProcessPoolExecutor(jobs) as executor:
+                totals = register.merge(
+                    executor.map(register.parse, register.chunk(body, jobs))
                 )
-            else:
-                transactions[key] = Transaction(time, account, commodity, quantity)
+        else:
+            totals = register.parse(body)
 
-        return list(transactions.values())
+        return [
+            Transaction(time, account, commodity, quantity)
+            for (account, time, commodity), quantity in totals.items()
+        ]
 
     def stats(self) -> Stats:
         """Returns ledger statistics."""
@@ -0,0 +1,59 @@
+"""Provides parsing of `hledger register` output."""
+
+# keep free of heavy imports - parallel parse workers import this on startup
+import csv
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+
+def parse(data: bytes) -> dict[tuple[str, date, str], Decimal]:
+    """Returns quantities of headerless `hledger register` TSV `data` summed by `(account, date, commodity)`."""
+
+    # returns in format (txnidx date code description account amount total)
+    reader = csv.reader(data.decode().splitlines(), delimiter="\t")
+
+    # combine transactions with same (account, date, commodity)
+    totals = dict[tuple[str, date, str], Decimal]()
+    for line in reader:
+        time = date.fromisoformat(line[1])
+        account = line[4]
+
+        quantityCommodity = line[5]
+        if " " in quantityCommodity:
+            splitI = quantityCommodity.index(" ")
+            quantity = Decimal(quantityCommodity[:splitI])
+            commodity = quantityCommodity[(splitI + 1) :].replace('"', "")
+        else:
+            quantity = Decimal(quantityCommodity)
+            commodity = "USD"
+
+        key = (account, time, commodity)
+        totals[key] = totals[key] + quantity if key in totals else quantity
+
+    return totals
+
+
+def chunk(data: bytes, count: int) -> Iterator[bytes]:
+    """Returns `data` split on line boundaries into at most `count` similarly-sized chunks."""
+
+    size = len(data) // count + 1
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", start + size)
+        end = len(data) if end < 0 else end + 1
+        yield data[start:end]
+        start = end
+
+
+def merge(
+    partials: Iterable[dict[tuple[str, date, str], Decimal]],
+) -> dict[tuple[str, date, str], Decimal]:
+    """Returns `partials` summed by key, in order of first appearance."""
+
+    totals = dict[tuple[str, date, str], Decimal]()
+    for partial in partials:
+        for key, quantity in partial.items():
+            totals[key] = totals[key] + quantity if key in totals else quantity
+
+    return totals
@@ -1,7 +1,8 @@
-from argparse import ArgumentParser, RawTextHelpFormatter
+from argparse import ArgumentParser, ArgumentTypeError, RawTextHelpFormatter
 from collections import defaultdict
-from datetime import timedelta
+from datetime import date, timedelta
 from decimal import Decimal
+from typing import Iterator
 
 from phtoolz.common import commodity
 from phtoolz.common.commodity import CommodityValue
@@ -10,6 +11,14 @@ from phtoolz.common.util import cumulativeSum, dateRange, fill
 from phtoolz.metrics.metrics import client
 
 
+def _positiveInt(value: str) -> int:
+    res = int(value)
+    if res < 1:
+        raise ArgumentTypeError(f"must be at least 1: {value}")
+
+    return res
+
+
 def _parseArgs():
     parser = ArgumentParser(
         description="Emits current ledger file metrics",
@@ -21,11 +30,32 @@ def _parseArgs():
         type=str,
         help="ledger file to read",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positiveInt,
+        default=1,
+        help="processes to parse ledger transactions with",
+    )
     parser.add_argument("-u", "--url", type=str, required=True, help="URL to write to")
 
     return parser.parse_args()
 
 
+def _lineage(account: str) -> Iterator[str]:
+    """Returns `account` followed by each of its parent accounts, deepest first."""
+
+    parts = account.split(":")
+    for i in range(len(parts), 0, -1):
+        yield ":".join(parts[:i])
+
+
+def _depth(account: str) -> int:
+    """Returns the depth of `account` in the account hierarchy, starting at 1."""
+
+    return account.count(":") + 1
+
+
 def cli():
     args = _parseArgs()
 
@@ -33,9 +63,10 @@ def cli():
     ledger = Ledger(args.input)
 
     accounts = ledger.accounts()
-    print(f"found {len(accounts)} accounts")
+    parents = {t for account in accounts for t in list(_lineage(account))[1:]}
+    print(f"found {len(accounts)} accounts with {len(parents)} parent accounts")
 
-    transactions = ledger.transactions()
+    transactions = ledger.transactions(jobs=args.jobs)
     start = min(transactions, key=lambda t: t.time).time
     end = max(transactions, key=lambda t: t.time).time + timedelta(days=1)
     transactionStarts = {
@@ -121,6 +152,7 @@ def cli():
         c.delete("finances.*")
 
         # write fresh samples
+        rollups = defaultdict[str, dict[date, Decimal]](dict)
         for group, samples in accountSamples.items():
             labels = dict(zip(("name", "commodity"), group))
 
@@ -129,13 +161,29 @@ def cli():
                 labels,
                 {t.time: total for t, total in samples},
             )
+
+            values = {
+                t.time: total * commodityValues[(t.time, t.commodity)].value
+                for t, total in samples
+            }
             c.push(
                 "finances_account_value",
-                labels,
-                {
-                    t.time: total * commodityValues[(t.time, t.commodity)].value
-                    for t, total in samples
-                },
+                {**labels, "depth": str(_depth(group[0])), "rollup": "false"},
+                values,
+            )
+
+            # aggregate up the account tree
+            for parent in _lineage(group[0]):
+                if parent in parents:
+                    rollup = rollups[parent]
+                    for time, value in values.items():
+                        rollup[time] = rollup.get(time, Decimal(0)) + value
+
+        for parent, samples in rollups.items():
+            c.push(
+                "finances_account_value",
+                {"name": parent, "depth": str(_depth(parent)), "rollup": "true"},
+                samples,
             )
 
         for group, samples in commodityValueSamples.items():
@@ -0,0 +1,99 @@
+import argparse
+import os
+import re
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from phtoolz.common import commodity
+from phtoolz.common.commodity import CommodityValue
+
+parser = argparse.ArgumentParser(
+    description="Compacts price directives in ledger files",
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+)
+parser.add_argument(
+    "-o",
+    "--output",
+    type=str,
+    required=True,
+    help="ledger file to compact in place",
+)
+
+_pricePattern = re.compile(r'^P\s+(\d{4}-\d{2}-\d{2})\s+("[^"]*"|\S+)\s+(\S+)\s*$')
+
+
+def parsePrice(line: str):
+    """Returns the commodity value of price directive `line`, or `None` if it is not a recognized price directive."""
+
+    match = _pricePattern.match(line)
+    if match is None:
+        return None
+
+    try:
+        return CommodityValue(
+            date.fromisoformat(match.group(1)),
+            match.group(2).replace('"', ""),
+            Decimal(match.group(3).replace(",", "")),
+        )
+    except (ValueError, InvalidOperation):
+        return None
+
+
+def compact(lines: list[str], end: date) -> list[str]:
+    """
+    Returns `lines` without superseded or duplicate price directives of the same `(commodity, date)`, and with historical stock prices thinned as of `end`.
+    All other lines are kept in their original order.
+    """
+
+    # keep only the last price of a (commodity, time) combo
+    prices = dict[tuple[str, date], int]()
+    values = dict[int, CommodityValue]()
+    for i, line in enumerate(lines):
+        value = parsePrice(line)
+        if value is not None:
+            prices[(value.name, value.time)] = i
+            values[i] = value
+
+    latest = {values[i]: i for i in prices.values()}
+    # thin only stocks - other commodities (e.g. tbill lifetimes) stay intact
+    kept = {
+        latest[t]
+        for t in commodity.thin(
+            (t for t in latest if commodity.typeOf(t.name) == "stock"), end
+        )
+    } | {i for t, i in latest.items() if commodity.typeOf(t.name) != "stock"}
+
+    return [t for i, t in enumerate(lines) if i not in values or i in kept]
+
+
+def write(path: str, lines: list[str]):
+    """Atomically replaces the contents of file at `path` with `lines`."""
+
+    # replace the target of any symlink, not the link itself
+    path = os.path.realpath(path)
+    fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".phprices-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("".join(f"{t}\n" for t in lines))
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmpPath)
+        os.replace(tmpPath, path)
+    except BaseException:
+        os.unlink(tmpPath)
+        raise
+
+
+def cli():
+    args = parser.parse_args()
+
+    with open(args.output) as f:
+        lines = f.read().splitlines()
+
+    compacted = compact(lines, datetime.today().date() + timedelta(days=1))
+
+    print(f"removing {len(lines) - len(compacted)} of {len(lines)} lines")
+    if len(compacted) < len(lines):
+        write(args.output, compacted)
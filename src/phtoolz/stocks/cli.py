@@ -41,24 +41,24 @@ def cli():
 
     print(f"getting stock prices for {len(stocks)} stocks from {start} to {end}")
     commodityStarts = {t.commodity: t.time for t in sorted(transactions, reverse=True)}
-    endHistorical = end - timedelta(days=90)
+    # thin along with existing prices so their windows are not filled again
+    existing = [t for t in ledger.prices() if t.name in stocks]
+    existingKeys = {(t.name, t.time) for t in existing}
     newValues = sorted(
+        # keep the journal thin - use sparser interval for historical prices
         t
-        for t in (
-            # keep the journal thin - use sparser interval for historical prices
-            (
-                set(
-                    list(
-                        commodity.values(
-                            stocks, start, endHistorical + timedelta(days=1)
-                        )
-                    )[::30]
-                )
-                | set(commodity.values(stocks, endHistorical, end))
-            )
-            - set(ledger.prices())
+        for t in commodity.thin(
+            [
+                *existing,
+                *(
+                    t
+                    for t in commodity.values(stocks, start, end)
+                    if t.time >= commodityStarts[t.name]
+                ),
+            ],
+            end,
         )
-        if t.time >= commodityStarts[t.name]
+        if (t.name, t.time) not in existingKeys
     )
 
     print(f"writing {len(newValues)} new values")
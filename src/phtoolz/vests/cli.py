@@ -1,37 +1,195 @@
 import argparse
+import csv
+import os
+import tomllib
+from typing import Iterable, Iterator, NamedTuple, Optional
 
+TAX_RATES = {
+    "oasdi": 0.062,
+    "medicare": 0.0145,
+    "federal": 0.22,
+    "state": 0.1023,
+    "vdi": 0.0103,
+}
 
 parser = argparse.ArgumentParser(
     description="Emits hledger forecast transactions for sell-to-cover vesting",
     formatter_class=argparse.RawTextHelpFormatter,
 )
-parser.add_argument("-p", "--period", type=str, required=True, help="period expression")
+parser.add_argument("-p", "--period", type=str, help="period expression")
+parser.add_argument("-s", "--shares", type=int, help="number of shares vesting")
+parser.add_argument("-u", "--unit", type=str, help="stock unit")
+parser.add_argument("-c", "--company", type=str, help="income company")
+parser.add_argument("-a", "--account", type=str, help="investment account")
 parser.add_argument(
-    "-s", "--shares", type=int, required=True, help="number of shares vesting"
+    "-g",
+    "--grants",
+    type=str,
+    help=f"""CSV or TOML file of grants to emit in batch instead
+CSV columns and TOML [[grant]] keys are:
+  period, shares, unit, company, account
+and optional per-grant tax rates:
+  {", ".join(TAX_RATES)}""",
 )
-parser.add_argument("-u", "--unit", type=str, required=True, help="stock unit")
-parser.add_argument("-c", "--company", type=str, required=True, help="income company")
 parser.add_argument(
-    "-a", "--account", type=str, required=True, help="investment account"
+    "-o",
+    "--output",
+    type=str,
+    help="ledger file to append forecasts to, skipping those already present",
 )
 
 
-def formatVestForecast(period: str, shares: int, unit: str, company: str, account: str):
+class Grant(NamedTuple):
+    """A vesting tranche."""
+
+    period: str
+    shares: int
+    unit: str
+    company: str
+    account: str
+    taxRates: dict[str, float]
+
+
+def formatVestForecast(
+    period: str,
+    shares: int,
+    unit: str,
+    company: str,
+    account: str,
+    taxRates: Optional[dict[str, float]] = None,
+):
+    rates = {**TAX_RATES, **(taxRates or {})}
+
     return f"""\
 ~ {period}  Vest
   income:{company}                          -{shares} {unit}
-  expenses:taxes:oasdi                  {round(shares * .062)} {unit}
-  expenses:taxes:medicare               {round(shares * .0145)} {unit}
-  expenses:taxes:federal                {round(shares * .22)} {unit}
-  expenses:taxes:state                  {round(shares * .1023)} {unit}
-  expenses:taxes:vdi                    {round(shares * .0103)} {unit}
+  expenses:taxes:oasdi                  {round(shares * rates["oasdi"])} {unit}
+  expenses:taxes:medicare               {round(shares * rates["medicare"])} {unit}
+  expenses:taxes:federal                {round(shares * rates["federal"])} {unit}
+  expenses:taxes:state                  {round(shares * rates["state"])} {unit}
+  expenses:taxes:vdi                    {round(shares * rates["vdi"])} {unit}
   assets:investment:{account}"""
 
 
+def parseGrant(row: dict) -> Grant:
+    """Returns the grant described by `row`, with tax rates for any non-empty tax columns."""
+
+    return Grant(
+        _required(row, "period"),
+        int(_required(row, "shares")),
+        _required(row, "unit"),
+        _required(row, "company"),
+        _required(row, "account"),
+        {k: float(row[k]) for k in TAX_RATES if row.get(k) not in (None, "")},
+    )
+
+
+def _required(row: dict, key: str) -> str:
+    """Returns the value of `key` in `row` as a string, raising a `ValueError` if it is missing or empty."""
+
+    value = row[key]
+    if value is None or not str(value).strip():
+        raise ValueError(f"empty {key}")
+
+    return str(value).strip()
+
+
+def readGrants(path: str) -> Iterator[Grant]:
+    """Returns grants from the CSV or TOML file at `path`."""
+
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            rows = enumerate(tomllib.load(f).get("grant", []), 1)
+            yield from (_parseGrantAt(f"grant {i}", t) for i, t in rows)
+    else:
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            yield from (_parseGrantAt(f"line {reader.line_num}", t) for t in reader)
+
+
+def _parseGrantAt(location: str, row: dict) -> Grant:
+    """Returns `parseGrant(row)`, raising a `ValueError` naming `location` if `row` is invalid."""
+
+    try:
+        return parseGrant(row)
+    except KeyError as e:
+        raise ValueError(f"{location}: missing {e}") from e
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"{location}: {e}") from e
+
+
+def _normalize(text: str) -> str:
+    """Returns `text` with all whitespace runs collapsed to single spaces."""
+
+    return " ".join(text.split())
+
+
+def _transactions(text: str) -> set[str]:
+    """Returns the whitespace-normalized transactions of ledger `text`, each starting at an unindented line."""
+
+    res = set[str]()
+    current = list[str]()
+    for line in text.splitlines():
+        if line and not line[0].isspace():
+            if current:
+                res.add(_normalize("\n".join(current)))
+            current = [line]
+        elif current:
+            current.append(line)
+
+    if current:
+        res.add(_normalize("\n".join(current)))
+
+    return res
+
+
+def newForecasts(grants: Iterable[Grant], existing: str) -> Iterator[str]:
+    """Returns formatted forecasts of `grants` not already a transaction in `existing` text."""
+
+    seen = _transactions(existing)
+    for grant in grants:
+        forecast = formatVestForecast(*grant)
+        normalized = _normalize(forecast)
+        if normalized not in seen:
+            seen.add(normalized)
+            yield forecast
+
+
 def cli():
     args = parser.parse_args()
-    print(
-        formatVestForecast(
-            args.period, args.shares, args.unit, args.company, args.account
-        )
-    )
+
+    fields = ("period", "shares", "unit", "company", "account")
+    if args.grants:
+        mixed = [f"--{k}" for k in fields if getattr(args, k) is not None]
+        if mixed:
+            parser.error(f"argument -g/--grants: not allowed with {', '.join(mixed)}")
+
+        try:
+            grants = list(readGrants(args.grants))
+        except ValueError as e:
+            parser.error(f"argument -g/--grants: {e}")
+    else:
+        missing = [f"--{k}" for k in fields if getattr(args, k) is None]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+
+        grants = [Grant(*(getattr(args, k) for k in fields), {})]
+
+    existing = ""
+    if args.output and os.path.exists(args.output):
+        with open(args.output) as f:
+            existing = f.read()
+
+    forecasts = newForecasts(grants, existing)
+    if args.output:
+        count = 0
+        with open(args.output, "a") as f:
+            for forecast in forecasts:
+                f.write(f"\n{forecast}\n")
+                count += 1
+        print(f"wrote {count} new forecasts")
+    else:
+        for i, forecast in enumerate(forecasts):
+            if i:
+                print()
+            print(forecast)